@@ -1,5 +1,6 @@
 import csv
 from collections import defaultdict
+from UnitCatalog import UnitCatalog, load_catalog
 
 # Load CSV Data
 def load_csv_data(filename):
@@ -13,26 +14,50 @@ def load_csv_data(filename):
 
 # Assign Players to ROTE Phase 1 Operations
 
-def assign_players_to_operations(player_data, character_data, ship_data, rote_operations):
-    """Assigns players to operations while ensuring max daily limits and unique character usage."""
+def assign_players_to_operations(player_data, character_data, ship_data, rote_operations, catalog=None):
+    """Assigns players to operations while ensuring max daily limits and unique character usage.
+
+    Units are joined on catalog IDs rather than display names. Roster rows are
+    resolved by name; a scraped unit_id is only checked against the catalog.
+    Without a catalog, a temporary one is built. Operation rows naming a unit
+    that cannot be resolved are reported and skipped.
+    """
     
     assignments = []
+    unresolved = set()
+    mismatched_ids = 0
+
+    if catalog is None:
+        catalog = UnitCatalog()
+
+    def roster_unit_id(row, name_field, unit_type):
+        nonlocal mismatched_ids
+        unit_id = catalog.unit_id(row[name_field], unit_type)
+        scraped_id = str(row.get("unit_id") or "")
+        if scraped_id.isdigit() and int(scraped_id) != unit_id:
+            mismatched_ids += 1
+        return unit_id
     
-    # Convert player character and ship data into lookup dictionaries
+    # Convert player character and ship data into lookup dictionaries keyed by unit ID
     player_characters = defaultdict(dict)
     for char in character_data:
-        player_characters[char["ally_code"]][char["character_name"]] = int(char["relic_level"])
+        player_characters[char["ally_code"]][roster_unit_id(char, "character_name", "character")] = int(char["relic_level"])
 
-    player_ships = defaultdict(dict)
+    # Inverted ship index: {unit_id: {stars: {ally_codes}}}
+    ship_players = defaultdict(lambda: defaultdict(set))
     for ship in ship_data:
-        player_ships[ship["ally_code"]][ship["ship_name"]] = int(ship["stars"])
+        ship_players[roster_unit_id(ship, "ship_name", "ship")][int(ship["stars"])].add(ship["ally_code"])
     
+    if mismatched_ids:
+        print(f"Warning: {mismatched_ids} roster unit_id values disagree with the unit catalog; units were matched by name.")
+
     # Convert player GP data into a lookup dictionary
     player_gp = {p["ally_code"]: int(p["gp"].replace(",", "")) for p in player_data}
 
     # Track daily placements
     daily_limits = defaultdict(lambda: defaultdict(int))  # {day: {ally_code: count}}
     daily_character_usage = defaultdict(lambda: defaultdict(set))  # {day: {ally_code: {characters_used}}}
+    daily_ship_usage = defaultdict(lambda: defaultdict(set))  # {day: {ally_code: {ships_used}}}
 
     # Sort players by least matches first (so those with most options go last)
     sorted_players = sorted(player_data, key=lambda p: len(player_characters[p["ally_code"]]))
@@ -42,11 +67,39 @@ def assign_players_to_operations(player_data, character_data, ship_data, rote_op
         phase = op["phase"]
         planet = op["planet"]
         operation = op["operation"]
-        required_character = op["character_name"]
-        
-        # FIX: Handle empty relicrequired values safely
-        relic_required = int(op["relicrequired"]) if op["relicrequired"].strip().isdigit() else 0
-        
+        required_ship = (op.get("ship_name") or "").strip()
+
+        if required_ship:
+            # Fleet slot: any player with the ship at or above the required stars
+            stars_required = int(op["starsrequired"]) if (op.get("starsrequired") or "").strip().isdigit() else 0
+            required_unit = catalog.lookup(required_ship, "ship")
+            if required_unit is None:
+                unresolved.add(required_ship)
+                continue
+            eligible = set()
+            for stars, ally_codes in ship_players.get(required_unit, {}).items():
+                if stars >= stars_required:
+                    eligible |= ally_codes
+            daily_unit_usage = daily_ship_usage
+            unit_fields = {"character_name": "", "relic_required": "", "ship_name": required_ship, "stars_required": stars_required}
+        else:
+            required_character = op["character_name"]
+
+            # FIX: Handle empty relicrequired values safely
+            relic_required = int(op["relicrequired"]) if op["relicrequired"].strip().isdigit() else 0
+
+            # Check which players have the required character at the required relic level
+            required_unit = catalog.lookup(required_character, "character")
+            if required_unit is None:
+                unresolved.add(required_character)
+                continue
+            eligible = {
+                ally_code for ally_code, characters in player_characters.items()
+                if required_unit in characters and characters[required_unit] >= relic_required
+            }
+            daily_unit_usage = daily_character_usage
+            unit_fields = {"character_name": required_character, "relic_required": relic_required, "ship_name": "", "stars_required": ""}
+
         assigned = False
 
         # Try to assign the requirement to a player
@@ -55,14 +108,13 @@ def assign_players_to_operations(player_data, character_data, ship_data, rote_op
                 ally_code = player["ally_code"]
                 player_name = player["player_name"]
 
-                # Check if player has the required character at the required relic level
-                if player_characters.get(ally_code, {}).get(required_character, 0) >= relic_required:
-                    
-                    # Check if the player has already used this character today
-                    if required_character in daily_character_usage[day][ally_code]:
-                        continue  # Skip if this character is already assigned today
+                if ally_code in eligible:
+
+                    # Check if the player has already used this unit today
+                    if required_unit in daily_unit_usage[day][ally_code]:
+                        continue  # Skip if this unit is already assigned today
 
-                    # Check daily unit limit per alignment
+                    # Check daily unit limit, shared by character and ship slots
                     if daily_limits[day][ally_code] < 10:
                         assignments.append({
                             "day": day,
@@ -72,22 +124,24 @@ def assign_players_to_operations(player_data, character_data, ship_data, rote_op
                             "phase": phase,
                             "planet": planet,
                             "operation": operation,
-                            "character_name": required_character,
-                            "relic_required": relic_required
+                            **unit_fields
                         })
-                        
+
                         # Increase daily count for this player
                         daily_limits[day][ally_code] += 1
 
-                        # Mark character as used for the day
-                        daily_character_usage[day][ally_code].add(required_character)
+                        # Mark unit as used for the day
+                        daily_unit_usage[day][ally_code].add(required_unit)
 
                         assigned = True
                         break  # Stop searching once assigned
-            
+
             if assigned:
                 break  # Move to next requirement
 
+    if unresolved:
+        print(f"Warning: skipped operations for units not found in any roster or the unit catalog: {', '.join(sorted(unresolved))}")
+
     return assignments
 
 
@@ -95,7 +149,7 @@ def assign_players_to_operations(player_data, character_data, ship_data, rote_op
 # Write Assignments to CSV
 def write_assignments_to_csv(assignments, output_file):
     """Writes the assigned players to a CSV file."""
-    fieldnames = ["day", "player_name", "ally_code", "alignment", "phase", "planet", "operation", "character_name", "relic_required"]
+    fieldnames = ["day", "player_name", "ally_code", "alignment", "phase", "planet", "operation", "character_name", "relic_required", "ship_name", "stars_required"]
     with open(output_file, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.DictWriter(file, fieldnames=fieldnames)
         writer.writeheader()
@@ -108,11 +162,17 @@ def main():
     # Load data from CSV files
     player_data = load_csv_data("player_data.csv")
     character_data = load_csv_data("character_relic_data.csv")
-    ship_data = load_csv_data("ship_data.csv")
     rote_operations = load_csv_data("ROTE_OPERATIONS.csv")
+    catalog = load_catalog("unit_catalog.csv")
+
+    # Only load ship data when the operations include fleet slots
+    if any((op.get("ship_name") or "").strip() for op in rote_operations):
+        ship_data = load_csv_data("ship_data.csv")
+    else:
+        ship_data = []
 
     # Assign players to missions
-    assignments = assign_players_to_operations(player_data, character_data, ship_data, rote_operations)
+    assignments = assign_players_to_operations(player_data, character_data, ship_data, rote_operations, catalog)
 
     # Write assignments to a CSV file
     write_assignments_to_csv(assignments, "rote_phase_one_assignments.csv")
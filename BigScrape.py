@@ -1,8 +1,11 @@
+import argparse
 import csv
 import os
 from GuildScraper import scrape_guild
-from PlayerScraper import parse_characters_and_relic_levels
-from shipScraper import parse_ships_and_stars
+from PlayerScraper import parse_characters_and_relic_levels, stream_characters_and_relic_levels, stream_html_from_url
+from shipScraper import parse_ships_and_stars, stream_ships_and_stars
+from RosterHistory import record_snapshot
+from UnitCatalog import load_catalog, save_catalog
 from bs4 import BeautifulSoup
 import requests
 
@@ -51,17 +54,21 @@ def write_to_csv(data, csv_file, fieldnames, mode="w"):
         writer.writerows(data)
 
 
-def scrape_guild_characters_and_ships(guild_url, output_dir):
+def scrape_guild_characters_and_ships(guild_url, output_dir, streaming=False):
     """
     Scrapes all character and ship data for a guild.
     Args:
         guild_url (str): The guild URL.
         output_dir (str): The directory to save the CSV files.
+        streaming (bool): Parse each page as it downloads instead of fetching
+            the whole page first. A page's units are still written only once
+            the page has finished, so a dropped connection leaves no partial roster.
     """
     # File paths
     player_data_csv = os.path.join(output_dir, "player_data.csv")
     character_csv = os.path.join(output_dir, "character_relic_data.csv")
     ship_csv = os.path.join(output_dir, "ship_data.csv")
+    catalog_csv = os.path.join(output_dir, "unit_catalog.csv")
 
     # Step 1: Scrape guild data
     print("Scraping guild player data...")
@@ -72,10 +79,11 @@ def scrape_guild_characters_and_ships(guild_url, output_dir):
     print(f"Found {len(players)} players in the guild.")
 
     # Step 3: Initialize CSV files for character and ship data
-    write_to_csv([], character_csv, ["ally_code", "character_name", "relic_level", "omicron_applied"], mode="w")
-    write_to_csv([], ship_csv, ["ally_code", "ship_name", "stars"], mode="w")
+    write_to_csv([], character_csv, ["ally_code", "unit_id", "character_name", "relic_level", "omicron_applied"], mode="w")
+    write_to_csv([], ship_csv, ["ally_code", "unit_id", "ship_name", "stars"], mode="w")
 
-    # Step 4: Scrape character and ship data for each player
+    # Step 4: Scrape character and ship data for each player, tagging units with catalog IDs
+    catalog = load_catalog(catalog_csv)
     base_profile_url = "https://swgoh.gg/p/"
 
     for player in players:
@@ -84,22 +92,37 @@ def scrape_guild_characters_and_ships(guild_url, output_dir):
 
         # Scrape character data
         character_url = f"{base_profile_url}{ally_code}/characters/"
-        # Inside your loop in BigScrape.py
-        character_html = fetch_html_from_url(character_url)
-        characters = parse_characters_and_relic_levels(character_html, ally_code)
-        write_to_csv(characters, character_csv, ["ally_code", "character_name", "relic_level", "omicron_applied"], mode="a")
+        if streaming:
+            characters = list(stream_characters_and_relic_levels(stream_html_from_url(character_url), ally_code, catalog))
+        else:
+            # Inside your loop in BigScrape.py
+            character_html = fetch_html_from_url(character_url)
+            characters = parse_characters_and_relic_levels(character_html, ally_code, catalog)
+        write_to_csv(characters, character_csv, ["ally_code", "unit_id", "character_name", "relic_level", "omicron_applied"], mode="a")
 
 
         # Scrape ship data
         ship_url = f"{base_profile_url}{ally_code}/ships/"
-        ship_html = fetch_html_from_url(ship_url)
-        ships = parse_ships_and_stars(ship_html, ally_code)
-        write_to_csv(ships, ship_csv, ["ally_code", "ship_name", "stars"], mode="a")
+        if streaming:
+            ships = list(stream_ships_and_stars(stream_html_from_url(ship_url), ally_code, catalog))
+        else:
+            ship_html = fetch_html_from_url(ship_url)
+            ships = parse_ships_and_stars(ship_html, ally_code, catalog)
+        write_to_csv(ships, ship_csv, ["ally_code", "unit_id", "ship_name", "stars"], mode="a")
+
+    save_catalog(catalog, catalog_csv)
+
+    # Step 5: Append this run to the roster history
+    record_snapshot(os.path.join(output_dir, "history"), character_csv, ship_csv, catalog=catalog)
 
     print("Scraping completed!")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape guild character and ship data.")
+    parser.add_argument("--stream", action="store_true", help="parse pages incrementally as they download")
+    args = parser.parse_args()
+
     # Guild URL and output directory
     guild_url = "https://swgoh.gg/g/tgo6MJitRvqRRvARhr60pQ/"  # Replace with your guild URL
     output_dir = "./output"
@@ -108,4 +131,4 @@ if __name__ == "__main__":
     os.makedirs(output_dir, exist_ok=True)
 
     # Run the scraper
-    scrape_guild_characters_and_ships(guild_url, output_dir)
+    scrape_guild_characters_and_ships(guild_url, output_dir, streaming=args.stream)
@@ -3,6 +3,8 @@ import os
 from GuildScraper import scrape_guild
 from OmiCronScrape import parse_characters_and_relic_levels
 from shipScraper import parse_ships_and_stars
+from RosterHistory import record_snapshot
+from UnitCatalog import load_catalog, save_catalog
 from bs4 import BeautifulSoup
 import requests
 
@@ -62,6 +64,7 @@ def scrape_guild_characters_and_ships(guild_url, output_dir):
     player_data_csv = os.path.join(output_dir, "player_data.csv")
     character_csv = os.path.join(output_dir, "character_relic_data.csv")
     ship_csv = os.path.join(output_dir, "ship_data.csv")
+    catalog_csv = os.path.join(output_dir, "unit_catalog.csv")
 
     # Step 1: Scrape guild data
     print("Scraping guild player data...")
@@ -72,10 +75,11 @@ def scrape_guild_characters_and_ships(guild_url, output_dir):
     print(f"Found {len(players)} players in the guild.")
 
     # Step 3: Initialize CSV files for character and ship data
-    write_to_csv([], character_csv, ["ally_code", "character_name", "relic_level", "omicron_applied"], mode="w")
-    write_to_csv([], ship_csv, ["ally_code", "ship_name", "stars"], mode="w")
+    write_to_csv([], character_csv, ["ally_code", "unit_id", "character_name", "relic_level", "omicron_applied"], mode="w")
+    write_to_csv([], ship_csv, ["ally_code", "unit_id", "ship_name", "stars"], mode="w")
 
-    # Step 4: Scrape character and ship data for each player
+    # Step 4: Scrape character and ship data for each player, tagging units with catalog IDs
+    catalog = load_catalog(catalog_csv)
     base_profile_url = "https://swgoh.gg/p/"
 
     for player in players:
@@ -86,15 +90,20 @@ def scrape_guild_characters_and_ships(guild_url, output_dir):
         character_url = f"{base_profile_url}{ally_code}/characters/"
         # Inside your loop in BigScrape.py
         character_html = fetch_html_from_url(character_url)
-        characters = parse_characters_and_relic_levels(character_html, ally_code)
-        write_to_csv(characters, character_csv, ["ally_code", "character_name", "relic_level", "omicron_applied"], mode="a")
+        characters = parse_characters_and_relic_levels(character_html, ally_code, catalog)
+        write_to_csv(characters, character_csv, ["ally_code", "unit_id", "character_name", "relic_level", "omicron_applied"], mode="a")
 
 
         # Scrape ship data
         ship_url = f"{base_profile_url}{ally_code}/ships/"
         ship_html = fetch_html_from_url(ship_url)
-        ships = parse_ships_and_stars(ship_html, ally_code)
-        write_to_csv(ships, ship_csv, ["ally_code", "ship_name", "stars"], mode="a")
+        ships = parse_ships_and_stars(ship_html, ally_code, catalog)
+        write_to_csv(ships, ship_csv, ["ally_code", "unit_id", "ship_name", "stars"], mode="a")
+
+    save_catalog(catalog, catalog_csv)
+
+    # Step 5: Append this run to the roster history
+    record_snapshot(os.path.join(output_dir, "history"), character_csv, ship_csv, catalog=catalog)
 
     print("Scraping completed!")
 
@@ -15,12 +15,13 @@ def fetch_html_from_url(url):
     response.raise_for_status()  # Raise an error if the request fails
     return response.text
 
-def parse_characters_and_relic_levels(html_content, ally_code):
+def parse_characters_and_relic_levels(html_content, ally_code, catalog=None):
     """
     Parses the HTML content to extract character names, relic levels, and Omicron status.
     Args:
         html_content (str): The HTML content.
         ally_code (str): The ally code of the player.
+        catalog (UnitCatalog): When given, a unit_id is added to each record.
 
     Returns:
         list[dict]: List of dictionaries containing character names, relic levels, and Omicron status.
@@ -53,12 +54,15 @@ def parse_characters_and_relic_levels(html_content, ally_code):
         print(f"Character: {character_name}, Relic Level: {relic_level}, Omicron: {has_omicron}")
 
         # Append the character data
-        character_data.append({
+        record = {
             "ally_code": ally_code,
             "character_name": character_name,
             "relic_level": relic_level,
             "omicron_applied": has_omicron
-        })
+        }
+        if catalog is not None:
+            record["unit_id"] = catalog.unit_id(character_name, "character")
+        character_data.append(record)
 
     return character_data
 
@@ -1,4 +1,6 @@
+import codecs
 import csv
+from html.parser import HTMLParser
 import requests
 from bs4 import BeautifulSoup
 
@@ -16,12 +18,30 @@ def fetch_html_from_url(url):
     response.raise_for_status()  # Raise an error if the request fails
     return response.text
 
-def parse_characters_and_relic_levels(html_content, ally_code):
+def stream_html_from_url(url, chunk_size=16384):
+    """
+    Fetches the HTML content from a URL, yielding it in pieces as it arrives.
+    Args:
+        url (str): The URL to fetch.
+        chunk_size (int): The number of bytes to read at a time.
+
+    Yields:
+        str: Decoded chunks of the page.
+    """
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()  # Raise an error if the request fails
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+def parse_characters_and_relic_levels(html_content, ally_code, catalog=None):
     """
     Parses the HTML content to extract character names, relic levels, and ally code.
     Args:
         html_content (str): The HTML content.
         ally_code (str): The ally code to include in the data.
+        catalog (UnitCatalog): When given, a unit_id is added to each record.
 
     Returns:
         list[dict]: List of dictionaries containing character names, relic levels, and ally code.
@@ -47,14 +67,106 @@ def parse_characters_and_relic_levels(html_content, ally_code):
             relic_level = "0"  # Default to 0 if no relic is present
 
         # Append the character data
-        character_data.append({
+        record = {
             "character_name": character_name,
             "relic_level": relic_level,
             "ally_code": ally_code
-        })
+        }
+        if catalog is not None:
+            record["unit_id"] = catalog.unit_id(character_name, "character")
+        character_data.append(record)
 
     return character_data
 
+class CharacterCardParser(HTMLParser):
+    """
+    Incremental parser that collects a character record each time a
+    unit-card closes. No document tree is kept, so memory stays flat
+    however much HTML is fed in.
+    """
+
+    def __init__(self, ally_code, catalog=None):
+        super().__init__()
+        self.ally_code = ally_code
+        self.catalog = catalog
+        self.records = []
+        self.div_depth = 0
+        self.card_depth = None  # div depth of the open unit-card
+        self.capture_depth = None  # div depth of the open name or relic div
+        self.capture_field = None
+        self.text = []
+        self.fields = {}
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "div":
+            return
+        self.div_depth += 1
+        classes = (dict(attrs).get("class") or "").split()
+
+        if self.card_depth is None:
+            if "unit-card" in classes:
+                self.card_depth = self.div_depth
+                self.fields = {}
+            return
+
+        if self.capture_field is None:
+            for field, css_class in (("character_name", "unit-card__name"), ("relic_level", "relic-badge")):
+                if css_class in classes and field not in self.fields:
+                    self.capture_field = field
+                    self.capture_depth = self.div_depth
+                    self.text = []
+                    break
+
+    def handle_endtag(self, tag):
+        if tag != "div":
+            return
+
+        if self.capture_field is not None and self.div_depth == self.capture_depth:
+            self.fields[self.capture_field] = "".join(self.text).strip()
+            self.capture_field = None
+            self.capture_depth = None
+
+        if self.div_depth == self.card_depth:
+            record = {
+                "character_name": self.fields.get("character_name", "Unknown"),
+                "relic_level": self.fields.get("relic_level", "0"),  # Default to 0 if no relic is present
+                "ally_code": self.ally_code
+            }
+            if self.catalog is not None:
+                record["unit_id"] = self.catalog.unit_id(record["character_name"], "character")
+            self.records.append(record)
+            self.card_depth = None
+
+        self.div_depth = max(self.div_depth - 1, 0)
+
+    def handle_data(self, data):
+        if self.capture_field is not None:
+            self.text.append(data)
+
+    def pop_records(self):
+        """Returns and clears the records completed so far."""
+        records, self.records = self.records, []
+        return records
+
+def stream_characters_and_relic_levels(html_chunks, ally_code, catalog=None):
+    """
+    Parses HTML chunks as they arrive, yielding each character as soon as
+    its unit-card has been read.
+    Args:
+        html_chunks (Iterable[str]): Pieces of the HTML content, e.g. from stream_html_from_url.
+        ally_code (str): The ally code to include in the data.
+        catalog (UnitCatalog): When given, a unit_id is added to each record.
+
+    Yields:
+        dict: Character name, relic level, and ally code.
+    """
+    parser = CharacterCardParser(ally_code, catalog)
+    for chunk in html_chunks:
+        parser.feed(chunk)
+        yield from parser.pop_records()
+    parser.close()
+    yield from parser.pop_records()
+
 def write_character_data_to_csv(character_data, csv_file):
     """
     Writes character data to a CSV file.
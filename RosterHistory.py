@@ -0,0 +1,336 @@
+import csv
+import gzip
+import os
+from datetime import datetime
+from UnitCatalog import UNIT_TYPES, load_catalog, save_catalog
+
+# Every Nth snapshot is stored in full so reconstruction never replays more
+# than KEYFRAME_INTERVAL - 1 deltas.
+KEYFRAME_INTERVAL = 10
+
+MANIFEST_FILE = "snapshots.csv"
+INDEX_FILE = "player_index.csv"
+CATALOG_FILE = "unit_catalog.csv"
+
+MANIFEST_FIELDS = ["snapshot_id", "taken_at", "kind", "file"]
+INDEX_FIELDS = ["ally_code", "snapshot_id"]
+ROW_FIELDS = ["ally_code", "unit_id", "level", "omicron_applied", "removed"]
+
+
+def _level(value):
+    """Converts a relic level or star count to an int, treating blanks as 0."""
+    value = str(value).strip()
+    return int(value) if value.isdigit() else 0
+
+
+def _read_csv(csv_file):
+    """Reads a CSV file into a list of dictionaries, or [] if it does not exist."""
+    if not os.path.exists(csv_file):
+        return []
+    with open(csv_file, mode="r", newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def _append_csv(rows, csv_file, fieldnames):
+    """Appends rows to a CSV file, writing the header if the file is new."""
+    is_new = not os.path.exists(csv_file)
+    with open(csv_file, mode="a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        if is_new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def roster_from_csvs(character_csv, ship_csv, catalog):
+    """
+    Builds a roster state from the CSV files written by BigScrape. Units are
+    resolved by name through the catalog; a scraped unit_id is only checked
+    against it.
+    Args:
+        character_csv (str): Path to character_relic_data.csv.
+        ship_csv (str): Path to ship_data.csv.
+        catalog (UnitCatalog): The unit catalog.
+
+    Returns:
+        dict: {(ally_code, unit_id): (level, omicron_applied)}
+    """
+    state = {}
+    mismatched_ids = 0
+    sources = (
+        (_read_csv(character_csv), "character_name", "character", "relic_level"),
+        (_read_csv(ship_csv), "ship_name", "ship", "stars"),
+    )
+    for rows, name_field, unit_type, level_field in sources:
+        for row in rows:
+            unit_id = catalog.unit_id(row[name_field], unit_type)
+            scraped_id = str(row.get("unit_id") or "")
+            if scraped_id.isdigit() and int(scraped_id) != unit_id:
+                mismatched_ids += 1
+            state[(row["ally_code"], unit_id)] = (str(row[level_field]), row.get("omicron_applied") or "")
+
+    if mismatched_ids:
+        print(f"Warning: {mismatched_ids} roster unit_id values disagree with the unit catalog; units were matched by name.")
+    return state
+
+
+def read_manifest(history_dir):
+    """
+    Reads the list of recorded snapshots, oldest first.
+    Args:
+        history_dir (str): The history directory.
+
+    Returns:
+        list[dict]: Manifest entries with snapshot_id, taken_at, kind and file.
+    """
+    return _read_csv(os.path.join(history_dir, MANIFEST_FILE))
+
+
+def read_player_index(history_dir):
+    """
+    Reads the ally code index.
+    Args:
+        history_dir (str): The history directory.
+
+    Returns:
+        dict: {ally_code: set of snapshot_ids that contain rows for that player}
+    """
+    index = {}
+    for row in _read_csv(os.path.join(history_dir, INDEX_FILE)):
+        index.setdefault(row["ally_code"], set()).add(row["snapshot_id"])
+    return index
+
+
+def _read_snapshot_rows(history_dir, entry, ally_code=None):
+    """Yields the stored rows of one snapshot, optionally for a single player."""
+    with gzip.open(os.path.join(history_dir, entry["file"]), mode="rt", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            if ally_code is None or row["ally_code"] == ally_code:
+                yield row
+
+
+def _apply_rows(state, rows):
+    """Applies keyframe or delta rows on top of a roster state."""
+    for row in rows:
+        key = (row["ally_code"], int(row["unit_id"]))
+        if row["removed"] == "1":
+            state.pop(key, None)
+        else:
+            state[key] = (row["level"], row["omicron_applied"])
+
+
+def _state_at(history_dir, manifest, position):
+    """
+    Reconstructs the roster state at manifest[position] from the nearest
+    preceding keyframe.
+    """
+    start = position
+    while manifest[start]["kind"] != "keyframe":
+        start -= 1
+
+    state = {}
+    for entry in manifest[start:position + 1]:
+        _apply_rows(state, _read_snapshot_rows(history_dir, entry))
+    return state
+
+
+def _position_as_of(manifest, as_of):
+    """Returns the position of the latest snapshot taken at or before as_of, or None."""
+    position = None
+    for i, entry in enumerate(manifest):
+        if entry["taken_at"] <= as_of:
+            position = i
+    return position
+
+
+def record_snapshot(history_dir, character_csv, ship_csv, taken_at=None, keyframe_interval=KEYFRAME_INTERVAL, catalog=None):
+    """
+    Appends the current scrape to the history as a delta against the previous
+    snapshot, or as a full keyframe every keyframe_interval snapshots. Rows
+    are keyed on unit IDs, and the catalog is saved alongside the history.
+    Args:
+        history_dir (str): The history directory.
+        character_csv (str): Path to character_relic_data.csv.
+        ship_csv (str): Path to ship_data.csv.
+        taken_at (str): ISO timestamp of the scrape. Defaults to now.
+        keyframe_interval (int): Number of snapshots between keyframes.
+        catalog (UnitCatalog): The scrape's unit catalog. Defaults to the history's copy.
+
+    Returns:
+        str: The new snapshot id.
+    """
+    os.makedirs(history_dir, exist_ok=True)
+    taken_at = taken_at or datetime.now().isoformat(timespec="seconds")
+
+    catalog_csv = os.path.join(history_dir, CATALOG_FILE)
+    if catalog is None:
+        catalog = load_catalog(catalog_csv)
+
+    manifest = read_manifest(history_dir)
+    current = roster_from_csvs(character_csv, ship_csv, catalog)
+    snapshot_id = str(len(manifest) + 1)
+    previous = _state_at(history_dir, manifest, len(manifest) - 1) if manifest else {}
+
+    # BigScrape writes no omicron data, so keep the last known omicron status
+    # rather than recording every character as changed.
+    for key, (level, omicron) in current.items():
+        if omicron == "" and key in previous:
+            current[key] = (level, previous[key][1])
+
+    rows = []
+    if len(manifest) % keyframe_interval == 0:
+        kind = "keyframe"
+        for (ally_code, unit_id), (level, omicron) in sorted(current.items()):
+            rows.append({"ally_code": ally_code, "unit_id": unit_id,
+                         "level": level, "omicron_applied": omicron, "removed": "0"})
+    else:
+        kind = "delta"
+        for key, value in sorted(current.items()):
+            if previous.get(key) != value:
+                rows.append({"ally_code": key[0], "unit_id": key[1],
+                             "level": value[0], "omicron_applied": value[1], "removed": "0"})
+        for key in sorted(previous.keys() - current.keys()):
+            rows.append({"ally_code": key[0], "unit_id": key[1],
+                         "level": "", "omicron_applied": "", "removed": "1"})
+
+    # Saved before the snapshot so every stored unit_id can be named.
+    save_catalog(catalog, catalog_csv)
+
+    file_name = f"snapshot_{int(snapshot_id):05d}.csv.gz"
+    with gzip.open(os.path.join(history_dir, file_name), mode="wt", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=ROW_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    ally_codes = sorted({row["ally_code"] for row in rows})
+    _append_csv([{"ally_code": a, "snapshot_id": snapshot_id} for a in ally_codes],
+                os.path.join(history_dir, INDEX_FILE), INDEX_FIELDS)
+    # The manifest is written last so a half-written snapshot is never referenced.
+    _append_csv([{"snapshot_id": snapshot_id, "taken_at": taken_at, "kind": kind, "file": file_name}],
+                os.path.join(history_dir, MANIFEST_FILE), MANIFEST_FIELDS)
+
+    print(f"Recorded {kind} snapshot {snapshot_id} ({len(rows)} rows) in {history_dir}.")
+    return snapshot_id
+
+
+def load_roster(history_dir, as_of=None):
+    """
+    Reconstructs the guild roster as it was at a point in time.
+    Args:
+        history_dir (str): The history directory.
+        as_of (str): ISO timestamp. Defaults to the latest snapshot.
+
+    Returns:
+        tuple[list[dict], list[dict]]: Character and ship rows in the same
+        shape as character_relic_data.csv and ship_data.csv.
+    """
+    manifest = read_manifest(history_dir)
+    if not manifest:
+        return [], []
+    position = len(manifest) - 1 if as_of is None else _position_as_of(manifest, as_of)
+    if position is None:
+        return [], []
+
+    catalog = load_catalog(os.path.join(history_dir, CATALOG_FILE))
+    characters, ships = [], []
+    for (ally_code, unit_id), (level, omicron) in sorted(_state_at(history_dir, manifest, position).items()):
+        if catalog.unit_types[unit_id] == "character":
+            characters.append({"ally_code": ally_code, "unit_id": unit_id, "character_name": catalog.name(unit_id),
+                               "relic_level": level, "omicron_applied": omicron})
+        else:
+            ships.append({"ally_code": ally_code, "unit_id": unit_id, "ship_name": catalog.name(unit_id), "stars": level})
+    return characters, ships
+
+
+def player_progression(history_dir, ally_code, unit_name=None, unit_type=None):
+    """
+    Builds the progression series for one player, reading only the snapshots
+    the ally code index lists for them. Unit filters are applied to those
+    snapshots' rows as they are read.
+    Args:
+        history_dir (str): The history directory.
+        ally_code (str): The player's ally code.
+        unit_name (str): Restrict the series to a single unit.
+        unit_type (str): Restrict the series to "character" or "ship" units.
+
+    Returns:
+        list[dict]: One entry per snapshot with snapshot_id, taken_at and
+        units ({(unit_type, unit_name): level}), named through the catalog.
+    """
+    catalog = load_catalog(os.path.join(history_dir, CATALOG_FILE))
+    unit_ids = None
+    if unit_name is not None:
+        unit_ids = {
+            catalog.lookup(unit_name, kind) for kind in UNIT_TYPES
+            if unit_type is None or kind == unit_type
+        } - {None}
+
+    def wanted(unit_id):
+        if unit_ids is not None and unit_id not in unit_ids:
+            return False
+        return unit_type is None or catalog.unit_types[unit_id] == unit_type
+
+    manifest = read_manifest(history_dir)
+    touched = read_player_index(history_dir).get(ally_code, set())
+
+    series = []
+    state = {}
+    for entry in manifest:
+        if entry["kind"] == "keyframe":
+            state = {}
+        if entry["snapshot_id"] in touched:
+            rows = _read_snapshot_rows(history_dir, entry, ally_code)
+            _apply_rows(state, (row for row in rows if wanted(int(row["unit_id"]))))
+
+        units = {
+            (catalog.unit_types[unit_id], catalog.name(unit_id)): _level(level)
+            for (_, unit_id), (level, _omicron) in state.items()
+        }
+        series.append({"snapshot_id": entry["snapshot_id"], "taken_at": entry["taken_at"], "units": units})
+    return series
+
+
+def units_reaching_level(history_dir, min_level, since, until=None, unit_type="character"):
+    """
+    Finds units that reached min_level between two points in time, e.g. who
+    gained R5+ characters this month.
+    Args:
+        history_dir (str): The history directory.
+        min_level (int): Relic level (characters) or stars (ships).
+        since (str): ISO timestamp of the start of the period.
+        until (str): ISO timestamp of the end of the period. Defaults to the latest snapshot.
+        unit_type (str): "character" or "ship".
+
+    Returns:
+        list[dict]: ally_code, unit_id, unit_name, from_level and to_level for each unit.
+    """
+    catalog = load_catalog(os.path.join(history_dir, CATALOG_FILE))
+    manifest = read_manifest(history_dir)
+    if not manifest:
+        return []
+
+    end = len(manifest) - 1 if until is None else _position_as_of(manifest, until)
+    if end is None:
+        return []
+    start = _position_as_of(manifest, since)
+    before = _state_at(history_dir, manifest, start) if start is not None else {}
+    after = _state_at(history_dir, manifest, end)
+
+    reached = []
+    for (ally_code, unit_id), (level, _omicron) in sorted(after.items()):
+        if catalog.unit_types[unit_id] != unit_type or _level(level) < min_level:
+            continue
+        previous = before.get((ally_code, unit_id))
+        from_level = _level(previous[0]) if previous else 0
+        if from_level < min_level:
+            reached.append({"ally_code": ally_code, "unit_id": unit_id, "unit_name": catalog.name(unit_id),
+                            "from_level": from_level, "to_level": _level(level)})
+    return reached
+
+
+if __name__ == "__main__":
+    # Record the latest BigScrape output into the history
+    output_dir = "./output"
+    record_snapshot(os.path.join(output_dir, "history"),
+                    os.path.join(output_dir, "character_relic_data.csv"),
+                    os.path.join(output_dir, "ship_data.csv"),
+                    catalog=load_catalog(os.path.join(output_dir, "unit_catalog.csv")))
@@ -0,0 +1,149 @@
+import csv
+import os
+import unicodedata
+
+CATALOG_FIELDS = ["unit_id", "unit_type", "name"]
+UNIT_TYPES = ["character", "ship"]
+
+# Typographic quotes that swgoh.gg and hand-written operation sheets mix freely
+QUOTE_TRANSLATION = str.maketrans({
+    "‘": "'", "’": "'", "‛": "'", "′": "'", "`": "'",
+    "“": '"', "”": '"', "‟": '"', "″": '"',
+})
+
+
+def normalize_unit_name(name):
+    """
+    Normalizes a unit display name so that spacing, quote style and case
+    differences map to the same key.
+    Args:
+        name (str): The display name.
+
+    Returns:
+        str: The normalized name.
+    """
+    name = unicodedata.normalize("NFKC", name).translate(QUOTE_TRANSLATION)
+    return " ".join(name.split()).casefold()
+
+
+class UnitCatalog:
+    """
+    Maps unit display names and aliases to stable integer IDs. The first
+    name registered for an ID is its canonical display name. Characters and
+    ships are separate namespaces, so a ship may share a character's name.
+    """
+
+    def __init__(self):
+        self.ids = {}  # {(unit_type, normalized name): unit_id}
+        self.names = {}  # {unit_id: canonical display name}
+        self.unit_types = {}  # {unit_id: "character" or "ship"}
+        self.aliases = {}  # {unit_id: [alias display names]}
+
+    def lookup(self, name, unit_type=None):
+        """
+        Returns the ID for a name or alias, or None if the unit is unknown.
+        Args:
+            name (str): The display name or alias.
+            unit_type (str): When given, only match a "character" or "ship" unit.
+
+        Returns:
+            int: The unit ID, or None.
+        """
+        key = normalize_unit_name(name)
+        for kind in ([unit_type] if unit_type is not None else UNIT_TYPES):
+            unit_id = self.ids.get((kind, key))
+            if unit_id is not None:
+                return unit_id
+        return None
+
+    def unit_id(self, name, unit_type="character"):
+        """
+        Returns the ID for a name or alias, registering a new unit if needed.
+        Args:
+            name (str): The display name.
+            unit_type (str): "character" or "ship".
+
+        Returns:
+            int: The unit ID.
+        """
+        key = (unit_type, normalize_unit_name(name))
+        if key not in self.ids:
+            new_id = max(self.names, default=0) + 1
+            self.ids[key] = new_id
+            self.names[new_id] = name.strip()
+            self.unit_types[new_id] = unit_type
+            self.aliases[new_id] = []
+        return self.ids[key]
+
+    def add_alias(self, alias, name, unit_type="character"):
+        """
+        Registers an alternative display name for an existing unit.
+        Args:
+            alias (str): The alternative name.
+            name (str): A name or alias already in the catalog.
+            unit_type (str): "character" or "ship".
+
+        Returns:
+            int: The unit ID.
+        """
+        unit_id = self.lookup(name, unit_type)
+        if unit_id is None:
+            raise ValueError(f"Unknown unit: {name}")
+
+        key = (unit_type, normalize_unit_name(alias))
+        existing = self.ids.get(key)
+        if existing is not None and existing != unit_id:
+            raise ValueError(f"Alias {alias} already belongs to {self.names[existing]}")
+        if existing is None:
+            self.ids[key] = unit_id
+            self.aliases[unit_id].append(alias.strip())
+        return unit_id
+
+    def name(self, unit_id):
+        """Returns the canonical display name for an ID."""
+        return self.names[unit_id]
+
+
+def load_catalog(catalog_csv):
+    """
+    Loads a unit catalog from a CSV file.
+    Args:
+        catalog_csv (str): Path to the catalog CSV file.
+
+    Returns:
+        UnitCatalog: The catalog, empty if the file does not exist yet.
+    """
+    catalog = UnitCatalog()
+    if not os.path.exists(catalog_csv):
+        print(f"Warning: {catalog_csv} not found, starting an empty unit catalog.")
+        return catalog
+
+    with open(catalog_csv, mode="r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            unit_id = int(row["unit_id"])
+            key = (row["unit_type"], normalize_unit_name(row["name"]))
+            if unit_id not in catalog.names:
+                catalog.names[unit_id] = row["name"]
+                catalog.unit_types[unit_id] = row["unit_type"]
+                catalog.aliases[unit_id] = []
+            else:
+                catalog.aliases[unit_id].append(row["name"])
+            catalog.ids[key] = unit_id
+    return catalog
+
+
+def save_catalog(catalog, catalog_csv):
+    """
+    Writes a unit catalog to a CSV file, one row per canonical name or alias.
+    Args:
+        catalog (UnitCatalog): The catalog to save.
+        catalog_csv (str): Path to the catalog CSV file.
+    """
+    with open(catalog_csv, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=CATALOG_FIELDS)
+        writer.writeheader()
+        for unit_id in sorted(catalog.names):
+            for name in [catalog.names[unit_id]] + catalog.aliases[unit_id]:
+                writer.writerow({"unit_id": unit_id, "unit_type": catalog.unit_types[unit_id], "name": name})
+
+    print(f"Unit catalog has been written to {catalog_csv}.")
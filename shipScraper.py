@@ -1,4 +1,6 @@
+import codecs
 import csv
+from html.parser import HTMLParser
 import requests
 from bs4 import BeautifulSoup
 
@@ -15,12 +17,30 @@ def fetch_html_from_url(url):
     response.raise_for_status()  # Raise an error if the request fails
     return response.text
 
-def parse_ships_and_stars(html_content, ally_code):
+def stream_html_from_url(url, chunk_size=16384):
+    """
+    Fetches the HTML content from a URL, yielding it in pieces as it arrives.
+    Args:
+        url (str): The URL to fetch.
+        chunk_size (int): The number of bytes to read at a time.
+
+    Yields:
+        str: Decoded chunks of the page.
+    """
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()  # Raise an error if the request fails
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+def parse_ships_and_stars(html_content, ally_code, catalog=None):
     """
     Parses the HTML content to extract ship names, star levels, and ally code.
     Args:
         html_content (str): The HTML content.
         ally_code (str): The ally code to include in the data.
+        catalog (UnitCatalog): When given, a unit_id is added to each record.
 
     Returns:
         list[dict]: List of dictionaries containing ship names, star levels, and ally code.
@@ -52,14 +72,103 @@ def parse_ships_and_stars(html_content, ally_code):
         print(f"Ship: {ship_name}, Stars: {active_stars}, Ally Code: {ally_code}")
 
         # Append the ship data
-        ship_data.append({
+        record = {
             "ally_code": ally_code,
             "ship_name": ship_name,
             "stars": active_stars
-        })
+        }
+        if catalog is not None:
+            record["unit_id"] = catalog.unit_id(ship_name, "ship")
+        ship_data.append(record)
 
     return ship_data
 
+class ShipCardParser(HTMLParser):
+    """
+    Incremental parser that collects a ship record each time a
+    unit-card-grid__cell closes. No document tree is kept, so memory stays
+    flat however much HTML is fed in.
+    """
+
+    def __init__(self, ally_code, catalog=None):
+        super().__init__()
+        self.ally_code = ally_code
+        self.catalog = catalog
+        self.records = []
+        self.div_depth = 0
+        self.card_depth = None  # div depth of the open unit-card-grid__cell
+        self.rarity_depth = None  # div depth of the open rarity-range
+        self.ship_name = "Unknown"
+        self.active_stars = 0
+        self.rarity_seen = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "div":
+            return
+        self.div_depth += 1
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if self.card_depth is None:
+            if "unit-card-grid__cell" in classes:
+                self.card_depth = self.div_depth
+                self.ship_name = attrs.get("data-unit-name", "Unknown")
+                self.active_stars = 0
+                self.rarity_seen = False
+            return
+
+        if self.rarity_depth is None:
+            # Only the first rarity range in a card is counted
+            if "rarity-range" in classes and not self.rarity_seen:
+                self.rarity_depth = self.div_depth
+                self.rarity_seen = True
+        elif "rarity-range__star" in classes and "rarity-range__star--inactive" not in classes:
+            self.active_stars += 1
+
+    def handle_endtag(self, tag):
+        if tag != "div":
+            return
+
+        if self.div_depth == self.rarity_depth:
+            self.rarity_depth = None
+
+        if self.div_depth == self.card_depth:
+            record = {
+                "ally_code": self.ally_code,
+                "ship_name": self.ship_name,
+                "stars": self.active_stars
+            }
+            if self.catalog is not None:
+                record["unit_id"] = self.catalog.unit_id(self.ship_name, "ship")
+            self.records.append(record)
+            self.card_depth = None
+
+        self.div_depth = max(self.div_depth - 1, 0)
+
+    def pop_records(self):
+        """Returns and clears the records completed so far."""
+        records, self.records = self.records, []
+        return records
+
+def stream_ships_and_stars(html_chunks, ally_code, catalog=None):
+    """
+    Parses HTML chunks as they arrive, yielding each ship as soon as its
+    card has been read.
+    Args:
+        html_chunks (Iterable[str]): Pieces of the HTML content, e.g. from stream_html_from_url.
+        ally_code (str): The ally code to include in the data.
+        catalog (UnitCatalog): When given, a unit_id is added to each record.
+
+    Yields:
+        dict: Ship name, star level, and ally code.
+    """
+    parser = ShipCardParser(ally_code, catalog)
+    for chunk in html_chunks:
+        parser.feed(chunk)
+        yield from parser.pop_records()
+    parser.close()
+    yield from parser.pop_records()
+
 def write_ship_data_to_csv(ship_data, csv_file):
     """
     Writes ship data to a CSV file.